@@ -167,6 +167,10 @@ class LoggerTestCase(unittest.TestCase):
         self.assertEqual(standardize_severity_string("wARNING"), "Warning")
         self.assertEqual(standardize_severity_string("CrItIcAl"), "Critical")
 
+        # Check the mapped name variations, with and without surrounding whitespace
+        self.assertEqual(standardize_severity_string("WARN"), "Warning")
+        self.assertEqual(standardize_severity_string(" Error "), "Critical")
+
     def test_pge_logger(self):
         """The PgeLogger class"""
         self.assertIsInstance(self.logger, PgeLogger)
@@ -305,6 +309,56 @@ class LoggerTestCase(unittest.TestCase):
                 self.assertIn("test_pge_args", line)
                 self.assertIn("1717", line)
 
+    def test_spill_to_file(self):
+        """
+        Test that a log exceeding the in-memory size limit is spilled to disk,
+        and continues to be written to and relocated correctly afterwards
+        """
+        spill_logger = PgeLogger(log_filename='test_spill.log')
+        spill_logger.MAX_IN_MEMORY_LOG_SIZE = 1024
+
+        # Nothing should be written to disk while under the size limit
+        spill_logger.info('opera_pge', 0, 'Message logged before the spill.')
+        self.assertFalse(exists('test_spill.log'))
+
+        for i in range(20):
+            spill_logger.info('opera_pge', 0, f'Message {i} logged to exceed the in-memory limit.')
+
+        self.assertTrue(exists('test_spill.log'))
+
+        # A spilled log should be relocated on disk when moved
+        spill_logger.move('test_spill_moved.log')
+        spill_logger.info('opera_pge', 0, 'Message logged after the move.')
+
+        self.assertFalse(exists('test_spill.log'))
+        self.assertTrue(exists('test_spill_moved.log'))
+
+        # A failed move should leave the log where it was, and still writable
+        with self.assertRaises(OSError):
+            spill_logger.move(join('nonexistent_dir', 'test_spill_failed.log'))
+
+        self.assertEqual(spill_logger.get_file_name(), 'test_spill_moved.log')
+        spill_logger.info('opera_pge', 0, 'Message logged after the failed move.')
+
+        # Stream object should still reflect the full contents of the log
+        self.assertIn('Message logged after the move.', spill_logger.get_stream_object().getvalue())
+        self.assertEqual(spill_logger.get_log_count_by_severity('info'), 23)
+
+        spill_logger.close_log_stream()
+
+        with open('test_spill_moved.log', 'r', encoding='utf-8') as file_handle:
+            log = file_handle.read()
+
+        self.assertIn('Message logged before the spill.', log)
+        self.assertIn('Message 19 logged to exceed the in-memory limit.', log)
+        self.assertIn('Message logged after the move.', log)
+        self.assertIn('Message logged after the failed move.', log)
+        self.assertIn('overall.elapsed_seconds', log)
+
+        # Nothing should be written to the log once it has been closed
+        with self.assertRaises(ValueError):
+            spill_logger.info('opera_pge', 0, 'Message logged after closing.')
+
     def test_append_sas_log(self):
         """
         Test appending of a SAS-formatted log file to ensure contents are parsed
@@ -330,11 +384,11 @@ class LoggerTestCase(unittest.TestCase):
         )
 
         # Check that each line appended to the PGE was formatted as expected
-        self.logger.log_stream.seek(0)
+        stream = self.logger.get_stream_object()
 
         match_iso_time = re.compile(self.iso_regex).match
 
-        for log_line in self.logger.log_stream.readlines():
+        for log_line in stream.readlines():
             line_components = log_line.split(',', maxsplit=6)
 
             line_components = tuple(map(str.strip, line_components))
@@ -370,6 +424,28 @@ class LoggerTestCase(unittest.TestCase):
             self.assertEqual(self.logger.error_code_base,
                              int(error_code) - error_code_map[severity])
 
+    def test_append_surrounding_whitespace(self):
+        """
+        Test that appending a file strips surrounding whitespace and blank lines
+        in the same way as appending the equivalent text directly
+        """
+        contents = '\n  \n   foo ,bar  \nmiddle line  \n\n  qux   \n \n\n'
+
+        with open('test_append_whitespace.txt', 'w', encoding='utf-8') as outfile:
+            outfile.write(contents)
+
+        self.logger.append('test_append_whitespace.txt')
+
+        expected_contents = 'foo ,bar  \nmiddle line  \n\n  qux\n'
+
+        self.assertEqual(self.logger.get_stream_object().getvalue(), expected_contents)
+
+        # Appending the same contents as text should produce identical results
+        text_logger = PgeLogger()
+        text_logger.append(contents)
+
+        self.assertEqual(text_logger.get_stream_object().getvalue(), expected_contents)
+
 
 if __name__ == "__main__":
     unittest.main()
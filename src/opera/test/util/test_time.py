@@ -7,14 +7,9 @@ test_time.py
 
 Unit tests for the util/time.py module.
 """
-import os
 import re
-import tempfile
 import unittest
-from datetime import datetime
-from os.path import abspath, join
-
-from pkg_resources import resource_filename
+from datetime import datetime, timedelta
 
 from opera.util.time import get_catalog_metadata_datetime_str
 from opera.util.time import get_current_iso_time
@@ -28,48 +23,24 @@ class TimeTestCase(unittest.TestCase):
     @classmethod
     def setUpClass(cls) -> None:
         """
-        Set up directories for testing
         Initialize regular expression
         Initialize other class variables
 
         """
-        cls.starting_dir = abspath(os.curdir)
-        cls.test_dir = resource_filename(__name__, "")
-        cls.data_dir = join(cls.test_dir, os.pardir, "data")
-
-        os.chdir(cls.test_dir)
+        # Fixed-width, non-capturing ISO pattern; fullmatch() provides the anchoring
+        cls.iso_regex = r'-?\d{4}-(?:0[1-9]|1[0-2])-(?:0[1-9]|[12]\d|3[01])T(?:[01]\d|2[0-3]):' \
+                        r'[0-5]\d:[0-5]\d(?:\.\d+)?Z'
+        cls.match_iso_time = re.compile(cls.iso_regex, re.ASCII).fullmatch
 
-        cls.config_file = join(cls.data_dir, "test_base_pge_config.yaml")
-        cls.iso_regex = r'^(-?(?:[0-9][0-9]*)?[0-9]{4})-(1[0-2]|0[1-9])-(3[01]|0[1-9]|[12][0-9])T(2[0-3]|[01][0-9]):' \
-                        r''r'([0-5][0-9]):([0-5][0-9])(\.[0-9]+)?(Z)$'
-        cls.match_iso_time = re.compile(cls.iso_regex).match
+        # Simple regex to test for YYYYMMDDTHHMMSS format ('Y'ear, 'M'onth, 'D'ay, 'T', 'H'our, 'M'inutes, 'S'econds)
+        cls.match_filename = re.compile(r'^\d{8}T\d{6}$').match
+        cls.match_nano = re.compile(r'^\d{10}Z$').match
         cls.reps = 1000
 
-    @classmethod
-    def tearDownClass(cls) -> None:
-        """
-        At completion re-establish starting directory
-        -------
-        """
-        os.chdir(cls.starting_dir)
-
-    def setUp(self) -> None:
-        """
-        Use the temporary directory as the working directory
-        -------
-        """
-        self.working_dir = tempfile.TemporaryDirectory(
-            prefix="test_time_", suffix='temp', dir=os.curdir
-        )
-        os.chdir(self.working_dir.name)
-
-    def tearDown(self) -> None:
-        """
-        Return to starting directory
-        -------
-        """
-        os.chdir(self.test_dir)
-        self.working_dir.cleanup()
+        # Generate the datetimes used by the tests up front, rather than
+        # calling datetime.now() on each iteration
+        base_datetime = datetime.now()
+        cls.datetimes = [base_datetime + timedelta(microseconds=i) for i in range(cls.reps)]
 
     def test_get_current_iso_time(self):
         """
@@ -79,10 +50,13 @@ class TimeTestCase(unittest.TestCase):
         the above pattern
 
         """
-        for i in range(self.reps):
+        match_iso_time = self.match_iso_time
+        assert_is_not_none = self.assertIsNotNone
+
+        for _ in range(self.reps):
             # Verify returned value
             time = get_current_iso_time()
-            self.assertEqual(time, self.match_iso_time(time).group())
+            assert_is_not_none(match_iso_time(time))
 
         # Test various bad strings
         time_1 = '20211102T15:51:39.95566Z'     # missing '-'
@@ -104,74 +78,67 @@ class TimeTestCase(unittest.TestCase):
         self.assertIsNone(self.match_iso_time(time_7))
         self.assertIsNone(self.match_iso_time(time_8))
 
-    def test_get_iso_time(self):
+    def _check_datetime_strings(self, dt):
         """
-        Convert datetime to ISO format
-        Verify that the result of datetime.datetime.now() is successfully changed to ISO time
+        Converts the provided datetime object to each of the supported time-tag
+        string formats, and verifies the format of each result.
+
+        Parameters
+        ----------
+        dt : datetime.datetime
+            The datetime object to convert.
 
         """
-        for i in range(self.reps):
-            dt = datetime.now()
-            time_in_iso = get_iso_time(dt)
-            # Verify that the datetime.now() result has been changed to ISO format
-            self.assertEqual(time_in_iso, self.match_iso_time(time_in_iso).group())
-
-        dt_str = str(dt)  # cast datetime.now() result to string for regex
-        # Verify that the datetime.now() format does not match iso_time
-        self.assertIsNone(self.match_iso_time(dt_str))
+        # Verify that the datetime has been changed to ISO format
+        self.assertIsNotNone(self.match_iso_time(get_iso_time(dt)))
+
+        # Verify the proper number of digits separated by 'T' in the filename time-tag
+        self.assertIsNotNone(self.match_filename(get_time_for_filename(dt)))
+
+        # Verify the nanosecond resolution of the catalog metadata time-tag
+        nano_str = get_catalog_metadata_datetime_str(dt).split('.')[-1]
+        self.assertIsNotNone(self.match_nano(nano_str))
 
-    def test_get_time_for_filename(self):
+    def test_datetime_strings(self):
         """
-        Converts the provided datetime object to a time-tag string suitable for
-        use with output filenames.
-        Verify the proper number of digits separated by 'T' in the string returned
+        Converts datetime objects to time-tag strings via get_iso_time(),
+        get_time_for_filename() and get_catalog_metadata_datetime_str()
+        Verify that each result matches the expected format, and that
+        malformed strings are rejected by each format check
+
         """
-        # Simple regex to test for YYYYMMDDTHHMMSS format ('Y'ear, 'M'onth, 'D'ay, 'T', 'H'our, 'M'inutes, 'S'econds)
-        filename_regex = r'^\d{8}T\d{6}$'
-
-        # Test multiple times
-        for i in range(self.reps):
-            dt = datetime.now()
-            time_for_fname = get_time_for_filename(dt)
-            self.assertEqual(time_for_fname, re.match(filename_regex, time_for_fname).group())
-
-        # Sanity check to verify that bad dates will not pass.
-        t1 = '202a1103T102328'  # bad year
-        t2 = '2021103T102328'   # not enough digits for month or day
-        t3 = '20211103102328'   # no 'T'
-        t4 = '20211103T1n2328'  # bad hour
-        t5 = '20211103T10228'   # bad min
-        t6 = '20211103T10232b'  # bad sec
+        check_datetime_strings = self._check_datetime_strings
+        sub_test = self.subTest
+
+        for dt in self.datetimes:
+            with sub_test(dt=dt):
+                check_datetime_strings(dt)
+
+        dt_str = str(self.datetimes[-1])  # cast datetime to its default string format for regex
+        # Verify that the default datetime string format does not match iso_time
+        self.assertIsNone(self.match_iso_time(dt_str))
+
+        # Sanity check to verify that bad filename time-tags will not pass.
+        bad_filename_strs = [
+            '202a1103T102328',  # bad year
+            '2021103T102328',   # not enough digits for month or day
+            '20211103102328',   # no 'T'
+            '20211103T1n2328',  # bad hour
+            '20211103T10228',   # bad min
+            '20211103T10232b'   # bad sec
+        ]
 
         # Assert that none of the above strings match the regex pattern.
-        self.assertIsNone(re.match(filename_regex, t1))
-        self.assertIsNone(re.match(filename_regex, t2))
-        self.assertIsNone(re.match(filename_regex, t3))
-        self.assertIsNone(re.match(filename_regex, t4))
-        self.assertIsNone(re.match(filename_regex, t5))
-        self.assertIsNone(re.match(filename_regex, t6))
-
-    def test_get_cat_metadata_datetime_str(self):
-        """
-        Converts the provided datetime object to a time-tag string suitable for use
-        in catalog metadata.
+        self.assertFalse(any(map(self.match_filename, bad_filename_strs)))
 
-        """
-        nano_regex = r'^\d{10}Z$'
-        # Test multiple times
-        for i in range(self.reps):
-            dt = datetime.now()
-            nano_str = get_catalog_metadata_datetime_str(dt).split('.')[-1]
-            self.assertEqual(nano_str, re.match(nano_regex, nano_str).group())
-
-        # Test some bad strings
-        t1 = '012345678Z'    # too few digits
-        t2 = '01234567899Z'  # too many digits
-        t3 = '0123456789'    # no 'Z'
-
-        self.assertIsNone(re.match(nano_regex, t1))
-        self.assertIsNone(re.match(nano_regex, t2))
-        self.assertIsNone(re.match(nano_regex, t3))
+        # Test some bad catalog metadata time-tag strings
+        bad_nano_strs = [
+            '012345678Z',    # too few digits
+            '01234567899Z',  # too many digits
+            '0123456789'     # no 'Z'
+        ]
+
+        self.assertFalse(any(map(self.match_nano, bad_nano_strs)))
 
 
 if __name__ == "__main__":
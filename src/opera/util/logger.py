@@ -12,10 +12,12 @@ Original Authors: Alice Stanboli, David White
 Adapted By: Scott Collins, Jim Hofman
 
 """
+import bisect
 import datetime
-import inspect
 import shutil
+import sys
 import time
+import weakref
 from io import StringIO
 from os.path import basename, isfile
 
@@ -26,6 +28,37 @@ from .error_codes import ErrorCode
 from .time import get_iso_time
 from .usage_metrics import get_os_metrics
 
+_get_current_iso_time = time_util.get_current_iso_time
+"""Module-level binding of the time-tag function used on every write() call"""
+
+_LINE_FMT = '{}, {}, {}, {}, {}, {}, "{}"\n'.format
+"""Bound format method used to assemble each line written to a log"""
+
+_SEVERITY_RANGE_STARTS = (error_codes.DEBUG_RANGE_START,
+                          error_codes.WARNING_RANGE_START,
+                          error_codes.CRITICAL_RANGE_START)
+"""Starting error code offsets for each severity range above Info"""
+
+_SEVERITY_LEVELS = ("Info", "Debug", "Warning", "Critical")
+"""Severity levels, in order of the error code ranges they are assigned to"""
+
+_SEVERITY_ALIASES = {
+    "Debug": "Debug",
+    "Info": "Info",
+    "Warning": "Warning",
+    "Warn": "Warning",
+    "Critical": "Critical",
+    "Error": "Critical"
+}
+"""Mapping of title-cased severity names (and variations) to their standard form"""
+
+_STANDARD_SEVERITY_BY_NAME = {
+    variant: standard
+    for name, standard in _SEVERITY_ALIASES.items()
+    for variant in (name, name.lower(), name.upper())
+}
+"""Precomputed standard severity strings for the commonly used spellings"""
+
 
 def write(log_stream, severity, workflow, module, error_code, error_location,
           description, time_tag=None):
@@ -52,14 +85,72 @@ def write(log_stream, severity, workflow, module, error_code, error_location,
         ISO format time tag to associate to the message. If not provided,
         the current time is used.
 
+    """
+    log_stream.write(
+        _format_log_line(severity, workflow, module, error_code,
+                         error_location, description, time_tag)
+    )
+
+
+def _format_log_line(severity, workflow, module, error_code, error_location,
+                     description, time_tag=None):
+    """
+    Formats the provided fields into a single, newline-terminated log line.
+
+    See write() for a description of the parameters.
+
     """
     if not time_tag:
-        time_tag = time_util.get_current_iso_time()
+        time_tag = _get_current_iso_time()
+
+    # Note that str() is used explicitly for the error code, since format()
+    # of an ErrorCode does not produce the same result on all Python versions
+    return _LINE_FMT(time_tag, severity, workflow, module, str(error_code),
+                     error_location, description)
+
+
+def _strip_lines(file_object):
+    """
+    Yields the lines of the provided text file, stripped in the same manner as
+    file_object.read().strip().split('\\n'), but without reading the entire
+    file into memory at once.
+
+    Parameters
+    ----------
+    file_object : io.TextIOBase
+        The text file to read lines from.
+
+    Yields
+    ------
+    line : str
+        The next line of the file, without its terminating newline.
 
-    message_str = f'{time_tag}, {severity}, {workflow}, {module}, ' \
-                  f'{str(error_code)}, {error_location}, "{description}"\n'
+    """
+    previous_line = None
+    blank_lines = []
+
+    for line in file_object:
+        line = line.rstrip('\n')
+
+        # Hold onto blank lines until we know they are not leading or trailing ones
+        if not line.strip():
+            if previous_line is not None:
+                blank_lines.append(line)
+            continue
+
+        if previous_line is None:
+            # First non-blank line, strip any leading whitespace
+            line = line.lstrip()
+        else:
+            yield previous_line
+            yield from blank_lines
+            blank_lines.clear()
 
-    log_stream.write(message_str)
+        previous_line = line
+
+    # Last non-blank line, strip any trailing whitespace. Empty (or blank)
+    # files result in a single empty line, as with str.split()
+    yield previous_line.rstrip() if previous_line is not None else ''
 
 
 def default_log_file_name():
@@ -78,7 +169,9 @@ def default_log_file_name():
         Path to the default log file name.
 
     """
-    log_datetime_str = time_util.get_time_for_filename(datetime.datetime.now())
+    # Equivalent to time_util.get_time_for_filename(datetime.datetime.now()),
+    # but without the need to construct an intermediate datetime object
+    log_datetime_str = time.strftime('%Y%m%dT%H%M%S')
     file_path = f"pge_{log_datetime_str}.log"
 
     return file_path
@@ -100,19 +193,10 @@ def get_severity_from_error_code(error_code):
         The severity level associated to the provided error code.
 
     """
-    # TODO: constants for max codes and severity strings
+    # TODO: constant for max codes
     error_code_offset = error_code % 10000
 
-    if error_code_offset < error_codes.DEBUG_RANGE_START:
-        return "Info"
-
-    if error_code_offset < error_codes.WARNING_RANGE_START:
-        return "Debug"
-
-    if error_code_offset < error_codes.CRITICAL_RANGE_START:
-        return "Warning"
-
-    return "Critical"
+    return _SEVERITY_LEVELS[bisect.bisect_right(_SEVERITY_RANGE_STARTS, error_code_offset)]
 
 
 def standardize_severity_string(severity):
@@ -130,16 +214,15 @@ def standardize_severity_string(severity):
         The standardized severity string.
 
     """
-    severity = severity.strip().title()  # first char uppercase, rest lowercase.
+    standard_severity = _STANDARD_SEVERITY_BY_NAME.get(severity)
 
-    # Convert some potential log level name variations
-    if severity == 'Warn':
-        severity = 'Warning'
+    if standard_severity:
+        return standard_severity
 
-    if severity == 'Error':
-        severity = 'Critical'
+    severity = severity.strip().title()  # first char uppercase, rest lowercase.
 
-    return severity
+    # Convert some potential log level name variations
+    return _SEVERITY_ALIASES.get(severity, severity)
 
 
 class PgeLogger:
@@ -155,6 +238,19 @@ class PgeLogger:
     LOGGER_CODE_BASE = 900000
     QA_LOGGER_CODE_BASE = 800000
 
+    LOGGED_LINE_CODE_BY_SEVERITY = {
+        "Debug": ErrorCode.LOGGED_DEBUG_LINE,
+        "Info": ErrorCode.LOGGED_INFO_LINE,
+        "Warning": ErrorCode.LOGGED_WARNING_LINE,
+        "Critical": ErrorCode.LOGGED_CRITICAL_LINE
+    }
+
+    MAX_IN_MEMORY_LOG_SIZE = 1 << 24
+    """Size (in characters) the in-memory log may reach before it is spilled to disk"""
+
+    LOG_FILE_BUFFER_SIZE = 1 << 20
+    """Buffer size (in bytes) used for the log file once the log is spilled to disk"""
+
     def __init__(self, workflow=None, error_code_base=None, log_filename=None):
         """
         Constructor opens the log file as a stream
@@ -179,9 +275,15 @@ class PgeLogger:
         if not log_filename:
             self.log_filename = default_log_file_name()
 
-        # open as an empty stream that will be kept in memory
-        self.log_stream = StringIO()
-        self.log_stream.seek(0)
+        # Log lines are kept in memory as a list of formatted strings, and
+        # only joined together when the log is written to disk. Should the
+        # in-memory log grow too large, it is spilled to log_filename, and all
+        # subsequent lines are written to that file directly.
+        self._log_chunks = []
+        self._log_chunks_size = 0
+        self._log_file = None
+        self._log_file_finalizer = None
+        self._closed = False
 
         self._workflow = (workflow
                           if workflow else f"pge_init::{basename(__file__)}")
@@ -214,15 +316,80 @@ class PgeLogger:
         Closes the log stream
 
         """
-        if self.log_stream and not self.log_stream.closed:
+        if not self._closed:
             self.write_log_summary()
 
-            self.log_stream.seek(0)
+            if self._log_file:
+                self._log_file_finalizer()
+                self._log_file = None
+            else:
+                with open(self.log_filename, 'w', encoding='utf-8') as outfile:
+                    outfile.write(''.join(self._log_chunks))
 
-            with open(self.log_filename, 'w', encoding='utf-8') as outfile:
-                shutil.copyfileobj(self.log_stream, outfile)
+            self._log_chunks = []
+            self._log_chunks_size = 0
+            self._closed = True
 
-            self.log_stream.close()
+    def _write_line(self, line):
+        """
+        Adds a single formatted line to the log, spilling the in-memory
+        log to disk if it has exceeded MAX_IN_MEMORY_LOG_SIZE.
+
+        Parameters
+        ----------
+        line : str
+            The newline-terminated line to add to the log.
+
+        Raises
+        ------
+        ValueError
+            If the log has already been closed by close_log_stream().
+
+        """
+        if self._log_file:
+            self._log_file.write(line)
+            return
+
+        if self._closed:
+            raise ValueError(f'Cannot write to closed log {self.log_filename}')
+
+        self._log_chunks.append(line)
+        self._log_chunks_size += len(line)
+
+        if self._log_chunks_size > self.MAX_IN_MEMORY_LOG_SIZE:
+            self._spill_to_file()
+
+    def _spill_to_file(self):
+        """
+        Writes the current in-memory log to log_filename, and keeps the file
+        open for writing of all subsequent log lines.
+
+        """
+        self._open_log_file('w')
+        self._log_file.write(''.join(self._log_chunks))
+
+        self._log_chunks = []
+        self._log_chunks_size = 0
+
+    def _open_log_file(self, mode):
+        """
+        Opens log_filename as the destination for all subsequent log lines.
+
+        A finalizer is registered against the opened file, rather than this
+        logger, so any buffered lines are still flushed to disk should the
+        logger be garbage collected (or the interpreter exit) before
+        close_log_stream() is called, without keeping the logger alive.
+
+        Parameters
+        ----------
+        mode : str
+            Mode to open the log file with, either 'w' or 'a'.
+
+        """
+        # pylint: disable=consider-using-with
+        self._log_file = open(self.log_filename, mode, encoding='utf-8',
+                              buffering=self.LOG_FILE_BUFFER_SIZE)
+        self._log_file_finalizer = weakref.finalize(self, self._log_file.close)
 
     def get_log_count_by_severity(self, severity):
         """
@@ -304,20 +471,27 @@ class PgeLogger:
 
         """
         severity = standardize_severity_string(severity)
-        self.increment_log_count_by_severity(severity)
 
-        caller = inspect.currentframe().f_back
+        # Tally the message directly for the known severity levels, only
+        # deferring to increment_log_count_by_severity() to report a bad level
+        log_count_by_severity = self.log_count_by_severity
+
+        if severity in log_count_by_severity:
+            log_count_by_severity[severity] += 1
+        else:
+            self.increment_log_count_by_severity(severity)
 
         # TODO: Can the number of back frames be determined implicitly?
         #       i.e. back up until the first non-logging frame is reached?
-        for _ in range(additional_back_frames):
-            caller = caller.f_back
+        caller = sys._getframe(1 + additional_back_frames)  # pylint: disable=protected-access
 
         location = caller.f_code.co_filename + ':' + str(caller.f_lineno)
 
-        write(self.log_stream, severity, self.workflow, module,
-              self.error_code_base + error_code_offset,
-              location, description)
+        self._write_line(
+            _format_log_line(severity, self.workflow, module,
+                             self.error_code_base + error_code_offset,
+                             location, description)
+        )
 
     def info(self, module, error_code_offset, description):
         """
@@ -449,12 +623,38 @@ class PgeLogger:
         new_filename : str
             The new filename (including path) to assign to this log file.
 
+        Raises
+        ------
+        OSError
+            If the log has already been spilled to disk, and the existing log
+            file could not be moved to the new location. The log remains at
+            its previous location, and may still be written to.
+
         """
-        self.log_filename = new_filename
+        if self._log_file:
+            # The log is already on disk, so relocate the file and keep
+            # writing to it from its new location
+            self._log_file_finalizer()
+
+            try:
+                shutil.move(self.log_filename, new_filename)
+                self.log_filename = new_filename
+            finally:
+                # Reopen the log from wherever it now resides, so logging can
+                # continue (and any failure be reported) even if the move failed
+                self._open_log_file('a')
+        else:
+            self.log_filename = new_filename
 
     def get_stream_object(self):
-        """Return the stingIO object for the current log."""
-        return self.log_stream
+        """Return a StringIO object containing the current contents of the log."""
+        if self._log_file:
+            self._log_file.flush()
+
+            with open(self.log_filename, 'r', encoding='utf-8') as infile:
+                return StringIO(infile.read())
+
+        return StringIO(''.join(self._log_chunks))
 
     def get_file_name(self):
         """Return the file name for the current log."""
@@ -473,22 +673,35 @@ class PgeLogger:
 
         """
         if isfile(source):
+            # Iterate over the file a line at a time, rather than reading it
+            # in all at once, to bound memory use when appending large logs
             with open(source, 'r', encoding='utf-8') as source_file_object:
-                source_contents = source_file_object.read().strip()
+                self._append_lines(_strip_lines(source_file_object))
         else:
-            source_contents = source.strip()
+            self._append_lines(source.strip().split('\n'))
+
+    def _append_lines(self, lines):
+        """
+        Appends each of the provided lines to this log.
 
+        Parameters
+        ----------
+        lines : iterable of str
+            The lines to append, without terminating newlines.
+
+        """
         # Parse the contents to append to see if they conform to the expected log
         # formatting for OPERA
-        for log_line in source_contents.split('\n'):
+        for log_line in lines:
             try:
                 parsed_line = self.parse_line(log_line)
-                write(self.log_stream, *parsed_line)
+                self._write_line(_format_log_line(*parsed_line))
+                # parse_line() only returns one of the standard severity levels
                 severity = parsed_line[0]
-                self.increment_log_count_by_severity(severity)
+                self.log_count_by_severity[severity] += 1
             # If the line does not conform to the expected formatting, just append as-is
             except ValueError:
-                self.log_stream.write(log_line + "\n")
+                self._write_line(log_line + "\n")
 
     def parse_line(self, line):
         """
@@ -541,12 +754,7 @@ class PgeLogger:
             description = description.replace('"', "'")
 
             # Map the error code based on message severity
-            error_code = {
-                "Debug": ErrorCode.LOGGED_DEBUG_LINE,
-                "Info": ErrorCode.LOGGED_INFO_LINE,
-                "Warning": ErrorCode.LOGGED_WARNING_LINE,
-                "Critical": ErrorCode.LOGGED_CRITICAL_LINE
-            }[severity]
+            error_code = self.LOGGED_LINE_CODE_BY_SEVERITY[severity]
 
             # Add the error code base
             error_code += self.error_code_base